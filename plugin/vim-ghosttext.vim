@@ -10,5 +10,15 @@ endfunction
 command! GhostStart :py3 GhostStart()
 command! GhostStop :py3 GhostStop()
 
-let s:pyscript = join([expand('<sfile>:p:h'), "..", "rplugin", "python3", "vim-ghosttext.py"], '/')
+let s:pydir = join([expand('<sfile>:p:h'), "..", "rplugin", "python3"], '/')
+let s:pyscript = join([s:pydir, "vim-ghosttext.py"], '/')
+
+" py3file does not add the script directory to sys.path, it is needed to
+" import the optional compiled ghosttext_frame module
+py3 << EOF
+import sys
+import vim
+if vim.eval("s:pydir") not in sys.path:
+    sys.path.append(vim.eval("s:pydir"))
+EOF
 execute 'py3file ' . s:pyscript
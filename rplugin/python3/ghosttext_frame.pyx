@@ -0,0 +1,20 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled WebSocket frame helpers for vim-ghosttext
+
+Build in place with `cythonize -i ghosttext_frame.pyx`, the plugin falls back to pure
+Python when this module is not available.
+"""
+
+
+def unmask(const unsigned char[:] src, unsigned int mask_key, unsigned char[:] dst):
+    cdef Py_ssize_t i
+    cdef unsigned char key[4]
+    key[0] = mask_key & 0xFF
+    key[1] = (mask_key >> 8) & 0xFF
+    key[2] = (mask_key >> 16) & 0xFF
+    key[3] = (mask_key >> 24) & 0xFF
+
+    # Plain loop over the buffers, the C compiler vectorizes the XOR
+    with nogil:
+        for i in range(src.shape[0]):
+            dst[i] = src[i] ^ key[i & 3]
@@ -4,31 +4,111 @@ import argparse
 import sys
 import os
 import re
-import time
 import json
 import signal
 import socket
+import struct
 import random
+import selectors
 import threading
 import hashlib
 import base64
 import textwrap
 import tempfile
+import http.server
 
 import logging
 
+try:
+    from ghosttext_frame import unmask as _unmask_c
+except ImportError:
+    _unmask_c = None
+
 try:
     import vim
 except Exception:
     from vimstub import vim
 
-import http.server as BaseHTTPServer
 PYCMD = "python3"
 
+WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+HANDSHAKE_RESPONSE = (
+    b"HTTP/1.1 101 Switching Protocols\r\n"
+    b"Upgrade: websocket\r\n"
+    b"Connection: Upgrade\r\n"
+    b"Sec-WebSocket-Accept: "
+)
+HANDSHAKE_KEY_RE = re.compile(r"^Sec-WebSocket-Key:\s+(\S+)\s*$", re.M)
+
+# ensure_ascii escapes any Unicode so the JSON can be encoded directly without
+# going through the UTF-8 codec
+JSON_ENCODE = json.JSONEncoder(separators=(",", ":"), ensure_ascii=True).encode
+
+# Fields sent to GhostText that do not change
+GHOSTTEXT_DATA = {
+    "title": "ghosttext-vim",
+    "url": "",
+    "syntax": "",
+}
+
 # --------------------------------------------------
 # Frame
 # --------------------------------------------------
 
+# NumPy and Numba are only imported once a payload of at least this size is
+# received, smaller payloads are fast enough without them and importing them
+# when the plugin is loaded would slow down Vim startup
+ACCEL_MIN_PAYLOAD = 64 * 1024
+
+# Set by _load_accel(), None if the module is not installed
+np = None
+_unmask_jit = None
+_accel_loaded = False
+
+
+def _unmask_loop(src, key, out):
+    for i in range(src.shape[0]):
+        out[i] = src[i] ^ key[i & 3]
+
+
+def _load_accel():
+    global np, _unmask_jit, _accel_loaded
+    if _accel_loaded:
+        return
+
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    unmask_jit = None
+    if numpy is not None:
+        try:
+            import numba
+        except ImportError:
+            numba = None
+
+        if numba is not None:
+            # Compiled unmask loop, nogil allows Vim to keep running while a
+            # large frame is decoded in the websocket thread
+            unmask_jit = numba.njit(nogil=True, cache=True)(_unmask_loop)
+            try:
+                # Compile (or load from the cache) now, an unusable cache
+                # falls back to NumPy instead of failing the websocket thread.
+                # Frame._unmask passes read-only arrays from bytes, and
+                # writable ones when the frame data is a bytearray
+                out = numpy.empty(4, dtype=numpy.uint8)
+                key = numpy.frombuffer(bytes(4), dtype=numpy.uint8)
+                unmask_jit(key, key, out)
+                unmask_jit(numpy.zeros(4, dtype=numpy.uint8), key, out)
+            except Exception:
+                logging.exception("Failed to compile unmask loop with Numba")
+                unmask_jit = None
+
+    np = numpy
+    _unmask_jit = unmask_jit
+    _accel_loaded = True
+
 
 class Frame(object):
     TEXT = 1
@@ -60,81 +140,117 @@ class Frame(object):
             self._set_data()
 
     def _parse(self):
-        data = self.data
-
-        self.fin = bool(data[0] & 0x80)
-        self.opcode = data[0] & 0x0F
-
-        self.mask = bool(data[1] & 0x80)
-        self.payload_len = data[1] & 0x7F
+        # Index through a memoryview so the payload is not copied until it is
+        # unmasked
+        data = memoryview(self.data)
+        byte0 = data[0]
+        byte1 = data[1]
+
+        self.fin = bool(byte0 & 0x80)
+        self.opcode = byte0 & 0x0F
+
+        self.mask = bool(byte1 & 0x80)
+        self.payload_len = byte1 & 0x7F
+
+        # Fast path for short masked text frames, which is most of what
+        # GhostText sends, the mask key always directly follows the header
+        if self.opcode == Frame.TEXT and self.mask and self.payload_len < 126:
+            if len(data) - 6 >= self.payload_len:
+                (self.mask_key,) = struct.unpack_from("<I", data, 2)
+                self.payload = Frame._unmask(
+                    data[6:], self.mask_key, self.payload_len
+                )
+                return
 
         next_byte = 2
         if self.payload_len == 126:
-            self.payload_len = 0
-            for i in range(2):
-                self.payload_len = (self.payload_len << 8) | data[i + next_byte]
-            next_byte = next_byte + i + 1
+            (self.payload_len,) = struct.unpack_from(">H", data, next_byte)
+            next_byte = next_byte + 2
         elif self.payload_len == 127:
-            self.payload_len = 0
-            for i in range(8):
-                self.payload_len = (self.payload_len << 8) | data[i + next_byte]
-            next_byte = next_byte + i + 1
+            (self.payload_len,) = struct.unpack_from(">Q", data, next_byte)
+            next_byte = next_byte + 8
 
         if self.mask:
-            self.mask_key = 0
-            for i in range(4):
-                self.mask_key = self.mask_key | (data[i + next_byte] << (8 * i))
-            next_byte = next_byte + i + 1
+            (self.mask_key,) = struct.unpack_from("<I", data, next_byte)
+            next_byte = next_byte + 4
 
-        self.payload = data[next_byte:]
+        payload = data[next_byte:]
 
-        if len(self.payload) < self.payload_len:
+        if len(payload) < self.payload_len:
             logging.error(
                 "Incorrect payload length: {} vs {}".format(
-                    len(self.payload), self.payload_len
+                    len(payload), self.payload_len
                 )
             )
+            self.payload = bytes(payload)
             self.valid = False
         else:
             if self.opcode == Frame.TEXT:
-                unmasked = bytearray()
-                for i in range(self.payload_len):
-                    j = i % 4
-                    incoming_octet = self.payload[i]
-                    mask_octet = (self.mask_key >> (j * 8)) & 0xFF
-                    unmasked.append(incoming_octet ^ mask_octet)
-                self.payload = unmasked
-            elif self.opcode == Frame.CLOSE:
+                self.payload = Frame._unmask(
+                    payload, self.mask_key, self.payload_len
+                )
+                return
+
+            self.payload = bytes(payload[: self.payload_len])
+            if self.opcode == Frame.CLOSE:
                 self.closed = True
             else:
                 logging.error("Unsupported opcode: {}".format(self.opcode))
                 self.valid = False
 
-    def _set_data(self):
-        self.data = bytearray()
-
-        self.data.extend(
-            [((self.fin & 0x1) << 7) | (self.opcode & 0xF)]
-        )
-
-        if self.payload_len >= 126:
-            if self.payload_len < (1 << 16):
-                self.data.append(((self.mask & 0x1) << 7) | 0x7E)
-                for i in reversed(list(range(2))):
-                    self.data.append((self.payload_len >> (i * 8)) & 0xFF)
-            else:
-                self.data.append(((self.mask & 0x1) << 7) | 0x7F)
-                for i in reversed(list(range(8))):
-                    self.data.append((self.payload_len >> (i * 8)) & 0xFF)
-        else:
-            self.data.append(((self.mask & 0x1) << 7) | (self.payload_len & 0x7F))
+    @staticmethod
+    def _unmask(payload, mask_key, length):
+        if _unmask_c is not None:
+            unmasked = bytearray(length)
+            _unmask_c(memoryview(payload)[:length], mask_key, unmasked)
+            return unmasked
+
+        if length >= ACCEL_MIN_PAYLOAD:
+            _load_accel()
+
+        if np is not None and length >= ACCEL_MIN_PAYLOAD:
+            key = np.frombuffer(struct.pack("<I", mask_key), dtype=np.uint8)
+            src = np.frombuffer(payload, dtype=np.uint8, count=length)
+            if _unmask_jit is not None:
+                unmasked = bytearray(length)
+                _unmask_jit(src, key, np.frombuffer(unmasked, dtype=np.uint8))
+                return unmasked
+            # XOR the whole payload at once, the mask key is tiled to the
+            # payload length
+            mask = np.tile(key, (length + 3) // 4)[:length]
+            return bytearray((src ^ mask).tobytes())
+
+        # Without NumPy XOR 8 bytes at a time using the mask key duplicated
+        # into a 64-bit word, then handle the remaining bytes individually
+        key8 = struct.pack("<I", mask_key) * 2
+        src = memoryview(payload)
+        unmasked = bytearray(length)
+        mask8 = int.from_bytes(key8, "little")
+        tail = length & ~7
+        for off in range(0, tail, 8):
+            word = int.from_bytes(src[off : off + 8], "little") ^ mask8
+            unmasked[off : off + 8] = word.to_bytes(8, "little")
+        # The tail starts on a multiple of 8 so it lines up with the mask key
+        unmasked[tail:] = bytes(src[tail + i] ^ key8[i] for i in range(length - tail))
+        return unmasked
 
+    def _set_data(self):
         if self.mask:
             if self.mask_key is None:
                 raise Exception("Missing mask key")
             raise Exception("TODO")
 
-        self.data.extend(self.payload)
+        byte0 = ((self.fin & 0x1) << 7) | (self.opcode & 0xF)
+        mask_bit = (self.mask & 0x1) << 7
+
+        if self.payload_len < 126:
+            header = struct.pack(">BB", byte0, mask_bit | self.payload_len)
+        elif self.payload_len < (1 << 16):
+            header = struct.pack(">BBH", byte0, mask_bit | 0x7E, self.payload_len)
+        else:
+            header = struct.pack(">BBQ", byte0, mask_bit | 0x7F, self.payload_len)
+
+        self.data = header + bytes(self.payload)
 
     def __str__(self):
         string = (
@@ -173,10 +289,21 @@ class WebSocketServer(object):
         self._sock = None
         self._conn = None
         self._addr = None
+        self._sel = selectors.DefaultSelector()
+
+        # Socket pair used to wake up the thread when Vim has data or the
+        # server is shutting down, so it can block on the selector
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._sel.register(self._wake_r, selectors.EVENT_READ)
 
         # Vim buffer to update
         self._vim_buffer = vim_buffer
 
+        # changedtick of the Vim buffer after the last update from GhostText,
+        # while it is unchanged GhostNotify does not send the text back
+        self._synced_tick = None
+
         # Lock for accessing Vim
         self._vim_lock = lock
 
@@ -188,7 +315,8 @@ class WebSocketServer(object):
         self._done = done
 
         # Indicates that data is available from Vim and that the thread has
-        # finished processing the data
+        # finished processing the data, from_thread is a semaphore shared by
+        # all threads that is released once per processed event
         self._to_thread = to_thread
         self._from_thread = from_thread
 
@@ -201,22 +329,25 @@ class WebSocketServer(object):
     def __del__(self):
         logging.info("Cleaning up websocket")
 
+    def wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except socket.error:
+            # Thread already finished
+            pass
+
     def serve_forever(self):
         logging.info("Serving")
         self._conn, self._addr = self._sock.accept()
         logging.info("Accepted connection")
+        self._sel.register(self._conn, selectors.EVENT_READ)
         self._handshake()
         logging.info("Handshake finished")
 
         loop = 0
-        update = time.time()
         while not self._done.is_set():
             loop = loop + 1
 
-            if time.time() - update >= 3:
-                update = time.time()
-                logging.info("Running...")
-
             # Check for data from socket
             recv = None
             if loop == 1:
@@ -234,11 +365,24 @@ class WebSocketServer(object):
                 # Indicate this socket is valid (for setting the event in GhostNotify)
                 self.valid = True
             else:
-                recv = self._recv(block=False)
+                # Block until GhostText sends data or Vim wakes up the thread,
+                # the timeout doubles as the heartbeat for the log
+                ready = self._wait(3)
+                if not ready:
+                    logging.info("Running...")
+                if self._wake_r in ready:
+                    self._drain_wake()
+                if self._conn in ready:
+                    recv = self._recv(block=False)
+                    if recv is None:
+                        logging.info("GhostText closed the socket")
+                        self._conn.close()
+                        self._conn = None
+                        break
 
             # If data was received on the socket
             if recv is not None:
-                frame = Frame(data=bytearray(recv))
+                frame = Frame(data=recv)
                 if not frame.valid:
                     self._vim_lock.acquire()
                     logging.error("Invalid frame received")
@@ -279,15 +423,25 @@ class WebSocketServer(object):
 
                 # Tell GhostNotify to quit blocking
                 logging.info("Thread done")
-                self._from_thread.set()
+                self._from_thread.release()
 
             if not self.valid:
                 break
 
-            time.sleep(0.001)
-
         logging.info("Done serving")
-        self.valid = False
+        # GhostNotify checks valid and sets to_thread while holding the lock,
+        # so after this either it skips this socket or the event is already
+        # set and GhostNotify is waiting for the release
+        with self._vim_lock:
+            self.valid = False
+            pending = self._to_thread.is_set()
+        if pending:
+            logging.info("Releasing GhostNotify for unprocessed event")
+            self._to_thread.clear()
+            self._from_thread.release()
+        self._sel.close()
+        self._wake_r.close()
+        self._wake_w.close()
         if self._conn is not None:
             # Send close frame
             self._conn.sendall(Frame(opcode=Frame.CLOSE).data)
@@ -296,31 +450,25 @@ class WebSocketServer(object):
 
     def _update_from_vim(self):
         logging.info("Getting data from vim, waiting for lock")
-        self._vim_lock.acquire()
-        logging.info("Lock acquired")
-
-        lines = self._vim_buffer[:]
-
-        self._vim_lock.release()
+        with self._vim_lock:
+            logging.info("Lock acquired")
+            # Join directly from the buffer instead of copying it to a list
+            text = "\n".join(self._vim_buffer)
         logging.info("Released lock")
-        text = "\n".join(lines)
         self._send_text(text)
 
     def _send_text(self, text):
-        data = {
-            "text": text,
-            "selections": [{"start": len(text), "end": len(text)}],
-            "title": "ghosttext-vim",
-            "url": "",
-            "syntax": "",
-        }
+        data = dict(
+            GHOSTTEXT_DATA,
+            text=text,
+            selections=[{"start": len(text), "end": len(text)}],
+        )
 
         logging.debug("Sending: '%s'", data)
 
-        frame = Frame(
-            fin=1, opcode=Frame.TEXT, mask=0, payload=json.dumps(data).encode("utf-8")
-        )
-        logging.debug("Sending: '%s'", str(frame))
+        payload = JSON_ENCODE(data).encode("ascii")
+        frame = Frame(fin=1, opcode=Frame.TEXT, mask=0, payload=payload)
+        logging.debug("Sending: '%s'", frame)
         try:
             self._conn.sendall(frame.data)
         except socket.error as e:
@@ -341,120 +489,95 @@ class WebSocketServer(object):
         request = json.loads(string)
 
         logging.info("Sending data to vim, waiting for lock")
-        self._vim_lock.acquire()
-        logging.info("Lock acquired")
+        with self._vim_lock:
+            logging.info("Lock acquired")
+            self._set_vim_lines(request["text"])
+            vim.command("checktime")
+            self._synced_tick = self._changedtick()
+        logging.info("Released lock")
+
+    def in_sync(self):
+        # Must be called with the Vim lock held
+        return self._synced_tick == self._changedtick()
 
-        vim.command(
-            "autocmd! TextChanged,TextChangedI * {} GhostNotify()".format(PYCMD)
+    def _changedtick(self):
+        return vim.eval(
+            "getbufvar({}, 'changedtick')".format(self._vim_buffer.number)
         )
-        self._vim_buffer[:] = request["text"].split("\n")
-        vim.command("checktime")
-        vim.command("autocmd TextChanged,TextChangedI * {} GhostNotify()".format(PYCMD))
 
-        self._vim_lock.release()
-        logging.info("Released lock")
+    def _set_vim_lines(self, text):
+        lines = text.split("\n")
+        old = self._vim_buffer[:]
+
+        # Compare the new lines against the current buffer contents and only
+        # replace the lines between their common prefix and suffix, so Vim
+        # does not need to re-process the whole buffer. Reading the buffer is
+        # cheap compared to writing it
+        n = min(len(old), len(lines))
+        start = 0
+        while start < n and old[start] == lines[start]:
+            start = start + 1
+        end = 0
+        while end < n - start and old[-1 - end] == lines[-1 - end]:
+            end = end + 1
+        self._vim_buffer[start : len(old) - end] = lines[start : len(lines) - end]
 
     def _handshake(self):
         msg = self._recv()
+        if msg is None:
+            raise Exception("Connection closed during handshake")
 
-        rx = re.compile("^Sec-WebSocket-Key:\s+(\S+)\s*$", re.M)
-        match = rx.search(msg.decode("utf-8"))
+        match = HANDSHAKE_KEY_RE.search(msg.decode("utf-8"))
         if not match:
             raise Exception("Did not match 'Sec-WebSocket-Key' in handshake")
         logging.debug("key = %s", match.group(1))
         accept = self.__class__._get_accept(match.group(1))
-        logging.debug("accept = %s", accept)
-
-        send = str(
-            "HTTP/1.1 101 Switching Protocols\r\n"
-            + "Upgrade: websocket\r\n"
-            + "Connection: Upgrade\r\n"
-            + "Sec-WebSocket-Accept: "
-            + accept
-            + "\r\n\r\n"
-        )
-        logging.debug(send)
-        self._conn.sendall(send.encode("utf-8"))
+        logging.debug("accept = %s", accept.decode("ascii"))
+
+        send = b"".join([HANDSHAKE_RESPONSE, accept, b"\r\n\r\n"])
+        logging.debug(send.decode("ascii"))
+        self._conn.sendall(send)
 
-    def _recv(self, buf_len=4096, timeout=None, sleep=0.1, block=True):
-        msg = None
+    def _recv(self, buf_len=4096, timeout=None, block=True):
+        parts = []
+        scratch = bytearray(buf_len)
+        view = memoryview(scratch)
         while True:
-            string = None
             if timeout is not None:
-                string = self._recv_timeout(buf_len, timeout, sleep)
-                if string is None:
+                # Wait for the socket to become readable instead of polling
+                # it, a wakeup before any data is received is treated as a
+                # timeout
+                if self._conn not in self._wait(timeout):
                     break
             elif not block:
-                try:
-                    self._conn.setblocking(0)
-                    string = self._conn.recv(buf_len)
-                    self._conn.setblocking(1)
-                except socket.error as e:
-                    if e.errno == 11:
-                        pass
-                    elif e.errno == 10035:
-                        pass
-                    else:
-                        raise
-                if string is None:
-                    # logging.debug("Exception")
-                    msg = None
-                    break
-                elif len(string) == 0:
-                    # logging.debug("No data")
-                    msg = None
+                if self._conn not in self._wait(0):
+                    # No more data available
                     break
-            else:
-                string = self._conn.recv(buf_len)
-            if msg is None:
-                msg = bytearray()
-            msg.extend(string)
-            if len(string) < buf_len:
+            n = self._conn.recv_into(scratch)
+            if n == 0:
+                # logging.debug("Socket closed")
                 break
-        return msg
-
-    def _recv_timeout(self, buf_len, timeout, sleep):
-        msg = None
-        prev = None
-        start_time = time.time()
-        while True:
-            if time.time() - start_time >= timeout:
-                msg = None
+            parts.append(bytes(view[:n]))
+            if n < buf_len:
                 break
+        if not parts:
+            return None
+        return b"".join(parts)
 
-            ret = bytearray()
-            try:
-                self._conn.setblocking(0)
-                ret = self._conn.recv(buf_len)
-                self._conn.setblocking(1)
-            except socket.error as e:
-                if e.errno == 11:
-                    pass
-                elif e.errno == 10035:
-                    pass
-                else:
-                    raise
+    def _wait(self, timeout):
+        return [key.fileobj for key, _ in self._sel.select(timeout)]
 
-            if len(ret):
-                if msg is None:
-                    msg = ret
-                else:
-                    msg = msg + ret
-                prev = ret
-            elif prev:
-                break
-
-            time.sleep(sleep)
-
-        return msg
+    def _drain_wake(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except socket.error:
+            pass
 
     @staticmethod
     def _get_accept(string):
-        sha = hashlib.sha1()
-        sha.update(string.encode("utf-8"))
-        sha.update("258EAFA5-E914-47DA-95CA-C5AB0DC85B11".encode("utf-8"))
-        accept = base64.b64encode(sha.digest())
-        return accept.decode("utf-8")
+        sha = hashlib.sha1(string.encode("ascii") + WEBSOCKET_GUID)
+        return base64.b64encode(sha.digest())
 
     @staticmethod
     def startwebsocket(port, vim_buffer, lock, done, to_thread, from_thread):
@@ -472,7 +595,7 @@ class WebSocketServer(object):
 # --------------------------------------------------
 
 
-class WebRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+class WebRequestHandler(http.server.BaseHTTPRequestHandler):
     def _set_headers(self):
         self.send_response(200)
         self.send_header("Content-type", "application/json")
@@ -488,18 +611,15 @@ class WebRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
         logging.info("Handling HTTP request, starting websocket on port %d", port)
 
         to_thread = threading.Event()
-        from_thread = threading.Event()
         sock = WebSocketServer.startwebsocket(
             port,
             vim.current.buffer,
             self.server.vim_lock,
             self.server.done,
             to_thread,
-            from_thread,
-        )
-        self.server.websocks.append(
-            {"sock": sock, "to_thread": to_thread, "from_thread": from_thread}
+            self.server.from_threads,
         )
+        self.server.websocks.append({"sock": sock, "to_thread": to_thread})
 
         logging.info("Websocket started on port %d", port)
         self.wfile.write(json.dumps(response_obj).encode())
@@ -511,15 +631,16 @@ class WebRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
         self.server.vim_lock.release()
 
 
-class MyHTTPServer(BaseHTTPServer.HTTPServer, object):
+class MyHTTPServer(http.server.HTTPServer):
     def __init__(self, *args, **kwargs):
-        super(MyHTTPServer, self).__init__(*args, **kwargs)
+        super().__init__(*args, **kwargs)
         if hasattr(self, "vim_lock"):
             raise
         if hasattr(self, "websocks"):
             raise
         self.vim_lock = threading.Lock()
         self.done = threading.Event()
+        self.from_threads = threading.Semaphore(0)
         self.websocks = []
 
 
@@ -563,6 +684,8 @@ def GhostStop():
 
         logging.info("Stopping threads")
         HTTPSERVER.done.set()
+        for ws in HTTPSERVER.websocks:
+            ws["sock"].wake()
         logging.info("Stopping HTTP server")
         HTTPSERVER.shutdown()
         HTTPSERVER = None
@@ -575,30 +698,32 @@ def GhostNotify():
     else:
         logging.info("GhostNotify update")
         found = 0
-        wait = []
+        synced = 0
         new = []
-        for ws in HTTPSERVER.websocks:
-            # Indicate to the valid websockets that there is data ready in Vim
-            if ws["sock"].valid:
-                new.append(ws)
-                if ws["to_thread"].is_set():
-                    logging.error("To event is already set")
-                if ws["from_thread"].is_set():
-                    logging.error("From event is already set")
-                found = found + 1
-                if found:
+        with HTTPSERVER.vim_lock:
+            for ws in HTTPSERVER.websocks:
+                # Indicate to the valid websockets that Vim has data ready
+                if ws["sock"].valid:
+                    new.append(ws)
+                    if ws["sock"].in_sync():
+                        # Buffer was last changed by GhostText, nothing to send
+                        synced = synced + 1
+                        continue
+                    if ws["to_thread"].is_set():
+                        logging.error("To event is already set")
+                    found = found + 1
                     logging.info("Setting event")
                     ws["to_thread"].set()
-                    wait.append(ws)
+                    ws["sock"].wake()
         HTTPSERVER.websocks = new
 
-        for ws in wait:
-            logging.info("Waiting for thread completion")
-            ws["from_thread"].wait()
-            logging.info("Thread done")
-            ws["from_thread"].clear()
+        # Each thread releases the semaphore once after sending the data
+        logging.info("Waiting for thread completion")
+        for _ in range(found):
+            HTTPSERVER.from_threads.acquire()
+        logging.info("Threads done")
 
-        if found == 0:
+        if found == 0 and synced == 0:
             logging.error("No valid websockets found")
         if found > 1:
             logging.error("Multiple valid websockets found")
@@ -638,10 +763,7 @@ if __name__ == "__main__":
             lines = []
             while not done[0]:
                 try:
-                    if sys.version_info >= (3, 0):
-                        string = eval(input("> "))
-                    else:
-                        string = input("> ")
+                    string = input("> ")
                 except EOFError:
                     print()
                     break
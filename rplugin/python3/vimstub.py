@@ -5,14 +5,25 @@ class Vim(object):
     def __init__(self):
         self.buffers = [Buffer()]
         self.current = self.buffers[0]
+        self._changedtick = 0
 
     def command(self, cmd):
         logging.info("vim.command(%s)", cmd)
 
+    def eval(self, expr):
+        logging.info("vim.eval(%s)", expr)
+        # Changes are not tracked, report a new changedtick on every call
+        self._changedtick = self._changedtick + 1
+        return str(self._changedtick)
+
+
+class Lines(list):
+    number = 1
+
 
 class Buffer(object):
     def __init__(self):
-        self.buffer = ["init"]
+        self.buffer = Lines(["init"])
 
 
 vim = Vim()